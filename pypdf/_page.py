@@ -50,7 +50,9 @@ from typing import (
 from ._cmap import build_char_map, unknown_char_map
 from ._protocols import PdfCommonDocProtocol
 from ._text_extraction import (
+    CharMap,
     OrientationNotFoundError,
+    TextState,
     _layout_mode,
     crlf_space_check,
     handle_tj,
@@ -1587,8 +1589,11 @@ class PageObject(DictionaryObject):
                 default = "/Content"
         """
         text: str = ""
-        output: str = ""
-        rtl_dir: bool = False  # right-to-left
+        # output is built as a list of chunks joined once on exit; last_char
+        # tracks the last character flushed to it ("" while it is still empty)
+        # so the hot path never rebuilds the accumulated string.
+        output: List[str] = []
+        last_char: str = ""
         cmaps: Dict[
             str,
             Tuple[
@@ -1607,17 +1612,13 @@ class PageObject(DictionaryObject):
             # no resources means no text is possible (no font) we consider the
             # file as not damaged, no need to check for TJ or Tj
             return ""
+        # CharMap objects are built once per font so that their precomputed
+        # decode tables are shared by all Tf operators selecting the font
+        charmaps: Dict[str, CharMap] = {}
         if "/Font" in resources_dict:
             for f in cast(DictionaryObject, resources_dict["/Font"]):
                 cmaps[f] = build_char_map(f, space_width, obj)
-        cmap: Tuple[
-            Union[str, Dict[int, str]], Dict[str, str], str, Optional[DictionaryObject]
-        ] = (
-            "charmap",
-            {},
-            "NotInitialized",
-            None,
-        )  # (encoding,CMAP,font resource name,dictionary-object of font)
+                charmaps[f] = CharMap(cmaps[f][2], cmaps[f][3], f, cmaps[f][4])
         try:
             content = (
                 obj[content_key].get_object() if isinstance(content_key, str) else obj
@@ -1630,83 +1631,83 @@ class PageObject(DictionaryObject):
         # are strings where the byte->string encoding was unknown, so adding
         # them to the text here would be gibberish.
 
-        cm_matrix: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+        st = TextState(space_width=500.0)  # will be set correctly at first Tf
         cm_stack = []
-        tm_matrix: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
 
-        # cm/tm_prev stores the last modified matrices can be an intermediate position
-        cm_prev: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
-        tm_prev: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+        # m_prev stores the combined matrix of the last crlf_space_check call;
+        # it can be an intermediate position
+        m_prev: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
 
         # memo_cm/tm will be used to store the position at the beginning of building the text
         memo_cm: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
         memo_tm: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
-        char_scale = 1.0
-        space_scale = 1.0
-        _space_width: float = 500.0  # will be set correctly at first Tf
-        TL = 0.0
-        font_size = 12.0  # init just in case of
 
-        def current_spacewidth() -> float:
-            return _space_width / 1000.0
+        def flush_text(visit_empty: bool = True) -> None:
+            # flush the pending text to the output (and the visitor) and reset
+            # it; BT/ET/cm pass even an empty pending text to the visitor,
+            # Tf and the end of the stream do not
+            nonlocal text, last_char
+            if text:
+                output.append(text)
+                last_char = text[-1]
+            if visitor_text is not None and (visit_empty or text):
+                visitor_text(text, memo_cm, memo_tm, st.cmap.font_dict, st.font_size)
+            text = ""
+
+        def memo_position() -> None:
+            # memo_cm/tm are only ever passed to the visitor
+            nonlocal memo_cm, memo_tm
+            if visitor_text is not None:
+                memo_cm = st.cm_matrix.copy()
+                memo_tm = st.tm_matrix.copy()
 
         def process_operation(operator: bytes, operands: List[Any]) -> None:
-            nonlocal cm_matrix, cm_stack, tm_matrix, cm_prev, tm_prev, memo_cm, memo_tm
-            nonlocal char_scale, space_scale, _space_width, TL, font_size, cmap
-            nonlocal orientations, rtl_dir, visitor_text, output, text
+            nonlocal cm_stack, m_prev, memo_cm, memo_tm
+            nonlocal orientations, visitor_text, text, last_char
             global CUSTOM_RTL_MIN, CUSTOM_RTL_MAX, CUSTOM_RTL_SPECIAL_CHARS
 
             check_crlf_space: bool = False
             # Table 5.4 page 405
             if operator == b"BT":
-                tm_matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
-                output += text
-                if visitor_text is not None:
-                    visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-                text = ""
-                memo_cm = cm_matrix.copy()
-                memo_tm = tm_matrix.copy()
+                st.tm_matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+                st.reset_m()
+                flush_text()
+                memo_position()
                 return None
             elif operator == b"ET":
-                output += text
-                if visitor_text is not None:
-                    visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-                text = ""
-                memo_cm = cm_matrix.copy()
-                memo_tm = tm_matrix.copy()
+                flush_text()
+                memo_position()
             # table 4.7 "Graphics state operators", page 219
             # cm_matrix calculation is a reserved for the moment
             elif operator == b"q":
                 cm_stack.append(
                     (
-                        cm_matrix,
-                        cmap,
-                        font_size,
-                        char_scale,
-                        space_scale,
-                        _space_width,
-                        TL,
+                        st.cm_matrix,
+                        st.cmap,
+                        st.font_size,
+                        st.char_scale,
+                        st.space_scale,
+                        st._space_width,
+                        st.text_leading,
                     )
                 )
             elif operator == b"Q":
                 try:
                     (
-                        cm_matrix,
-                        cmap,
-                        font_size,
-                        char_scale,
-                        space_scale,
-                        _space_width,
-                        TL,
+                        st.cm_matrix,
+                        st.cmap,
+                        st.font_size,
+                        st.char_scale,
+                        st.space_scale,
+                        st._space_width,
+                        st.text_leading,
                     ) = cm_stack.pop()
                 except Exception:
-                    cm_matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+                    st.cm_matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+                st.reset_m()
             elif operator == b"cm":
-                output += text
-                if visitor_text is not None:
-                    visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-                text = ""
-                cm_matrix = mult(
+                flush_text()
+                st.cm_matrix = mult(
                     [
                         float(operands[0]),
                         float(operands[1]),
@@ -1715,49 +1716,38 @@ class PageObject(DictionaryObject):
                         float(operands[4]),
                         float(operands[5]),
                     ],
-                    cm_matrix,
+                    st.cm_matrix,
                 )
-                memo_cm = cm_matrix.copy()
-                memo_tm = tm_matrix.copy()
+                st.reset_m()
+                memo_position()
             # Table 5.2 page 398
             elif operator == b"Tz":
-                char_scale = float(operands[0]) / 100.0
+                st.char_scale = float(operands[0]) / 100.0
             elif operator == b"Tw":
-                space_scale = 1.0 + float(operands[0])
+                st.space_scale = 1.0 + float(operands[0])
             elif operator == b"TL":
-                TL = float(operands[0])
+                st.text_leading = float(operands[0])
             elif operator == b"Tf":
-                if text != "":
-                    output += text  # .translate(cmap)
-                    if visitor_text is not None:
-                        visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-                text = ""
-                memo_cm = cm_matrix.copy()
-                memo_tm = tm_matrix.copy()
+                flush_text(visit_empty=False)
+                memo_position()
                 try:
                     # charMapTuple: font_type, float(sp_width / 2), encoding,
                     #               map_dict, font-dictionary
-                    charMapTuple = cmaps[operands[0]]
-                    _space_width = charMapTuple[1]
-                    # current cmap: encoding, map_dict, font resource name
-                    #               (internal name, not the real font-name),
-                    # font-dictionary. The font-dictionary describes the font.
-                    cmap = (
-                        charMapTuple[2],
-                        charMapTuple[3],
-                        operands[0],
-                        charMapTuple[4],
-                    )
+                    st._space_width = cmaps[operands[0]][1]
+                    # the CharMap describes encoding, map_dict, font resource
+                    # name (internal name, not the real font-name) and the
+                    # font-dictionary describing the font
+                    st.cmap = charmaps[operands[0]]
                 except KeyError:  # font not found
-                    _space_width = unknown_char_map[1]
-                    cmap = (
+                    st._space_width = unknown_char_map[1]
+                    st.cmap = CharMap(
                         unknown_char_map[2],
                         unknown_char_map[3],
                         "???" + operands[0],
                         None,
                     )
                 try:
-                    font_size = float(operands[1])
+                    st.font_size = float(operands[1])
                 except Exception:
                     pass  # keep previous size
             # Table 5.5 page 406
@@ -1766,13 +1756,15 @@ class PageObject(DictionaryObject):
                 # A special case is a translating only tm:
                 # tm[0..5] = 1 0 0 1 e f,
                 # i.e. tm[4] += tx, tm[5] += ty.
+                tm_matrix = st.tm_matrix
                 tx = float(operands[0])
                 ty = float(operands[1])
                 tm_matrix[4] += tx * tm_matrix[0] + ty * tm_matrix[2]
                 tm_matrix[5] += tx * tm_matrix[1] + ty * tm_matrix[3]
+                st.reset_m()
             elif operator == b"Tm":
                 check_crlf_space = True
-                tm_matrix = [
+                st.tm_matrix = [
                     float(operands[0]),
                     float(operands[1]),
                     float(operands[2]),
@@ -1780,49 +1772,43 @@ class PageObject(DictionaryObject):
                     float(operands[4]),
                     float(operands[5]),
                 ]
+                st.reset_m()
             elif operator == b"T*":
                 check_crlf_space = True
-                tm_matrix[5] -= TL
+                st.tm_matrix[5] -= st.text_leading
+                st.reset_m()
 
             elif operator == b"Tj":
                 check_crlf_space = True
-                text, rtl_dir = handle_tj(
+                text = handle_tj(
                     text,
                     operands,
-                    cm_matrix,
-                    tm_matrix,  # text matrix
-                    cmap,
+                    st,
                     orientations,
-                    output,
-                    font_size,
-                    rtl_dir,
                     visitor_text,
                 )
             else:
                 return None
             if check_crlf_space:
                 try:
-                    text, output, cm_prev, tm_prev = crlf_space_check(
+                    text, last_char, m_prev = crlf_space_check(
                         text,
-                        (cm_prev, tm_prev),
-                        (cm_matrix, tm_matrix),
+                        m_prev,
+                        st,
                         (memo_cm, memo_tm),
-                        cmap,
                         orientations,
                         output,
-                        font_size,
+                        last_char,
                         visitor_text,
-                        current_spacewidth(),
                     )
                     if text == "":
-                        memo_cm = cm_matrix.copy()
-                        memo_tm = tm_matrix.copy()
+                        memo_position()
                 except OrientationNotFoundError:
                     return None
 
         for operands, operator in content.operations:
             if visitor_operand_before is not None:
-                visitor_operand_before(operator, operands, cm_matrix, tm_matrix)
+                visitor_operand_before(operator, operands, st.cm_matrix, st.tm_matrix)
             # multiple operators are defined in here ####
             if operator == b"'":
                 process_operation(b"T*", [])
@@ -1836,32 +1822,43 @@ class PageObject(DictionaryObject):
                 process_operation(b"TL", [-operands[1]])
                 process_operation(b"Td", operands)
             elif operator == b"TJ":
+                # the matrices cannot change inside a TJ array, so the
+                # crlf_space_check run by the Tj operation would compare
+                # identical positions for all fragments after the first
+                # processed one; call handle_tj directly for those
+                first_fragment = True
                 for op in operands[0]:
                     if isinstance(op, (str, bytes)):
-                        process_operation(b"Tj", [op])
+                        if first_fragment:
+                            process_operation(b"Tj", [op])
+                            first_fragment = False
+                        else:
+                            text = handle_tj(text, [op], st, orientations, visitor_text)
                     if isinstance(op, (int, float, NumberObject, FloatObject)) and (
-                        (abs(float(op)) >= _space_width)
+                        (abs(float(op)) >= st._space_width)
                         and (len(text) > 0)
                         and (text[-1] != " ")
                     ):
-                        process_operation(b"Tj", [" "])
-            elif operator == b"Do":
-                output += text
-                if visitor_text is not None:
-                    visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-                try:
-                    if output[-1] != "\n":
-                        output += "\n"
-                        if visitor_text is not None:
-                            visitor_text(
-                                "\n",
-                                memo_cm,
-                                memo_tm,
-                                cmap[3],
-                                font_size,
+                        if first_fragment:
+                            process_operation(b"Tj", [" "])
+                            first_fragment = False
+                        else:
+                            text = handle_tj(
+                                text, [" "], st, orientations, visitor_text
                             )
-                except IndexError:
-                    pass
+            elif operator == b"Do":
+                flush_text()
+                if last_char not in ("", "\n"):
+                    output.append("\n")
+                    last_char = "\n"
+                    if visitor_text is not None:
+                        visitor_text(
+                            "\n",
+                            memo_cm,
+                            memo_tm,
+                            st.cmap.font_dict,
+                            st.font_size,
+                        )
                 try:
                     xobj = resources_dict["/XObject"]
                     if xobj[operands[0]]["/Subtype"] != "/Image":  # type: ignore
@@ -1873,15 +1870,7 @@ class PageObject(DictionaryObject):
                             visitor_operand_after,
                             visitor_text,
                         )
-                        output += text
-                        if visitor_text is not None:
-                            visitor_text(
-                                text,
-                                memo_cm,
-                                memo_tm,
-                                cmap[3],
-                                font_size,
-                            )
+                        flush_text()
                 except Exception:
                     logger_warning(
                         f" impossible to decode XFormObject {operands[0]}",
@@ -1889,17 +1878,14 @@ class PageObject(DictionaryObject):
                     )
                 finally:
                     text = ""
-                    memo_cm = cm_matrix.copy()
-                    memo_tm = tm_matrix.copy()
+                    memo_position()
 
             else:
                 process_operation(operator, operands)
             if visitor_operand_after is not None:
-                visitor_operand_after(operator, operands, cm_matrix, tm_matrix)
-        output += text  # just in case of
-        if text != "" and visitor_text is not None:
-            visitor_text(text, memo_cm, memo_tm, cmap[3], font_size)
-        return output
+                visitor_operand_after(operator, operands, st.cm_matrix, st.tm_matrix)
+        flush_text(visit_empty=False)  # just in case of
+        return "".join(output)
 
     def _layout_mode_fonts(self) -> Dict[str, _layout_mode.Font]:
         """
@@ -5,20 +5,266 @@ Some parts are still in _page.py. In doubt, they will stay there.
 """
 
 import math
+import re
+from collections import deque
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from ..generic import DictionaryObject, TextStringObject, encode_pdfdocencoding
+from ..generic import DictionaryObject, TextStringObject
 
 CUSTOM_RTL_MIN: int = -1
 CUSTOM_RTL_MAX: int = -1
 CUSTOM_RTL_SPECIAL_CHARS: List[int] = []
 LAYOUT_NEW_BT_GROUP_SPACE_WIDTHS: int = 5
 
+# Character classes used by handle_tj to decide the insertion order:
+# 0 = keep the current insertion order, 1 = right-to-left, 2 = left-to-right.
+# The table covers the basic multilingual plane; code points beyond it are
+# classified by the (rare) fallback in handle_tj.
+_RTL_CLASS = bytearray(0x10000)
+
+# frozenset mirror of CUSTOM_RTL_SPECIAL_CHARS for O(1) membership tests
+_SPECIAL_SET: "frozenset[int]" = frozenset()
+
+# C-level scan for characters that *may* be right-to-left. A run without any
+# match is guaranteed fully left-to-right, so handle_tj can append it in one
+# operation; a match only routes the run to the exact per-glyph classifier,
+# so the character class may safely overmatch (e.g. custom specials inside a
+# right-to-left range).
+_RTL_SEARCH = re.compile("[֐-ࣿיִ-﷿ﹰ-﻿]").search
+
+
+# bumped on every rebuild; diagnostic only — the hot paths never check it,
+# they rely on _rebuild_rtl_caches keeping all derived structures consistent
+_RTL_VERSION: int = 0
+
+
+def _rebuild_rtl_caches() -> None:
+    """
+    Recompute every structure derived from the ``CUSTOM_RTL_*`` parameters.
+
+    This is the single invalidation point for ``_SPECIAL_SET``, ``_RTL_SEARCH``
+    and the ``_RTL_CLASS`` table: ``set_custom_rtl`` calls it after updating
+    the module globals, so the fast paths can read the caches without any
+    staleness checks.
+    """
+    global _SPECIAL_SET, _RTL_SEARCH, _RTL_VERSION
+    _RTL_VERSION += 1
+    _SPECIAL_SET = frozenset(CUSTOM_RTL_SPECIAL_CHARS)
+    pattern = "[֐-ࣿיִ-﷿ﹰ-﻿"
+    # clamp to the valid chr() range; a custom range lying entirely outside
+    # it is a no-op, exactly as it is for the classification table below
+    lo_c = max(CUSTOM_RTL_MIN, 0)
+    hi_c = min(CUSTOM_RTL_MAX, 0x10FFFF)
+    if lo_c <= hi_c:
+        pattern += re.escape(chr(lo_c)) + "-" + re.escape(chr(hi_c))
+    _RTL_SEARCH = re.compile(pattern + "]").search
+    table = bytearray([2]) * 0x10000
+    # right-to-left characters set
+    table[0x0590:0x0900] = b"\x01" * (0x0900 - 0x0590)
+    table[0xFB1D:0xFE00] = b"\x01" * (0xFE00 - 0xFB1D)
+    table[0xFE70:0xFF00] = b"\x01" * (0xFF00 - 0xFE70)
+    lo = max(CUSTOM_RTL_MIN, 0)
+    hi = min(CUSTOM_RTL_MAX + 1, 0x10000)
+    if lo < hi:
+        table[lo:hi] = b"\x01" * (hi - lo)
+    # cases where the current inserting order is kept; they take precedence
+    # over the custom right-to-left range, as in the historical if/elif chain
+    table[0x0000:0x0030] = b"\x00" * 0x0030  # punctuations but...
+    table[0x003A:0x0041] = b"\x00" * (0x0041 - 0x003A)  # numbers (x30-39)
+    table[0x2000:0x2070] = b"\x00" * (0x2070 - 0x2000)  # upper punctuations..
+    # but (numbers) indices/exponents
+    table[0x20A0:0x2200] = b"\x00" * (0x2200 - 0x20A0)
+    for special in CUSTOM_RTL_SPECIAL_CHARS:  # customized....
+        if 0 <= special < 0x10000:
+            table[special] = 0
+    _RTL_CLASS[:] = table
+
+
+_rebuild_rtl_caches()
+
 
 class OrientationNotFoundError(Exception):
     pass
 
 
+# (newline axis is x, newline sign) per orientation: the four orientation
+# branches of crlf_space_check only differ in which delta is the newline axis
+# and in the sign of the new-line threshold
+_ORIENT_PARAMS: Dict[int, Tuple[bool, float]] = {
+    0: (False, 1.0),
+    180: (False, -1.0),
+    90: (True, -1.0),
+    270: (True, 1.0),
+}
+
+
+class CharMap:
+    """
+    Character map of the font selected by the last Tf operator.
+
+    Wraps the encoding, map_dict, font resource name and font dictionary
+    produced by ``pypdf._cmap.build_char_map``. When the encoding is a dict, a
+    256-entry decode table is precomputed once per font so that byte strings
+    are decoded with one C-level list subscript per byte instead of two dict
+    lookups. Table entries are ``None`` for bytes that are neither mapped nor
+    plain ASCII; decoding such a byte falls back to the historical slow path
+    (and its historical ``UnicodeDecodeError``).
+    """
+
+    __slots__ = (
+        "encoding",
+        "map_dict",
+        "font_name",
+        "font_dict",
+        "decode_table",
+        "byte_table",
+        "translate_table",
+    )
+
+    def __init__(
+        self,
+        encoding: Union[str, Dict[int, str]],
+        map_dict: Dict[str, str],
+        font_name: str,
+        font_dict: Optional[DictionaryObject],
+    ) -> None:
+        self.encoding = encoding
+        self.map_dict = map_dict
+        self.font_name = font_name
+        self.font_dict = font_dict
+        self.decode_table: Optional[List[Optional[str]]] = None
+        self.byte_table: Optional[bytes] = None
+        if not isinstance(encoding, str):
+            self.decode_table = [
+                encoding.get(i, chr(i) if i < 128 else None) for i in range(256)
+            ]
+            # when the whole codomain fits in Latin-1, decoding collapses to a
+            # single bytes.translate + decode("latin-1") pair instead of a
+            # per-byte comprehension (chr(translated) == decode_table entry)
+            if all(
+                isinstance(c, str) and len(c) == 1 and ord(c) <= 0xFF
+                for c in self.decode_table
+            ):
+                self.byte_table = bytes(
+                    ord(c) for c in self.decode_table  # type: ignore[arg-type]
+                )
+        # when every character entry of map_dict maps one character to one
+        # character the whole mapping can run as a single C-level
+        # str.translate call; non-str keys (bookkeeping entries) can never
+        # match a character lookup and are ignored, while multi-character
+        # entries keep the per-character comprehension, which treats each
+        # mapped value as one insertion unit
+        self.translate_table: Optional[Dict[int, str]] = None
+        char_entries = {k: v for k, v in map_dict.items() if isinstance(k, str)}
+        if all(
+            len(k) == 1 and isinstance(v, str) and len(v) == 1
+            for k, v in char_entries.items()
+        ):
+            self.translate_table = str.maketrans(char_entries)
+
+
+class TextState:
+    """
+    Mutable text/graphics state threaded through the plain-text extraction loop.
+
+    Bundles the parameters previously carried as individual locals of
+    ``PageObject._extract_text`` and caches the product of the text matrix and
+    the current transformation matrix, which every text-showing operator needs.
+    Callers mutating ``tm_matrix`` or ``cm_matrix`` must call ``reset_m`` so
+    the cached product is recomputed on the next access.
+    """
+
+    __slots__ = (
+        "cm_matrix",
+        "tm_matrix",
+        "cmap",
+        "font_size",
+        "char_scale",
+        "space_scale",
+        "_space_width_raw",
+        "_space_width_flt",
+        "text_leading",
+        "rtl_dir",
+        "_m_cache",
+        "_orient_cache",
+        "_thresh_cache",
+    )
+
+    def __init__(self, space_width: float = 500.0) -> None:
+        self.cm_matrix: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+        self.tm_matrix: List[float] = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+        self.cmap: CharMap = CharMap("charmap", {}, "NotInitialized", None)
+        self.font_size: float = 12.0
+        self.char_scale: float = 1.0
+        self.space_scale: float = 1.0
+        self._space_width: float = space_width  # will be set correctly at first Tf
+        self.text_leading: float = 0.0
+        self.rtl_dir: bool = False  # right-to-left
+        self._m_cache: Optional[List[float]] = None
+        self._orient_cache: Optional[int] = None
+        self._thresh_cache: Optional[
+            Tuple[float, float, float, float, float, float]
+        ] = None
+
+    def m(self) -> List[float]:
+        """Return ``mult(tm_matrix, cm_matrix)``, cached until a matrix changes."""
+        if self._m_cache is None:
+            self._m_cache = mult(self.tm_matrix, self.cm_matrix)
+        return self._m_cache
+
+    def orientation(self) -> int:
+        """
+        Return ``orient`` of the combined matrix, cached alongside it.
+
+        The matrices cannot change between the fragments of one TJ array (or
+        between consecutive Tj operators without positioning in between), so
+        the orientation only needs recomputing when ``reset_m`` fires.
+        """
+        if self._orient_cache is None:
+            self._orient_cache = orient(self.m())
+        return self._orient_cache
+
+    def reset_m(self) -> None:
+        """Invalidate the cached matrix product after a matrix mutation."""
+        self._m_cache = None
+        self._orient_cache = None
+
+    @property
+    def _space_width(self) -> float:
+        return self._space_width_raw
+
+    @_space_width.setter
+    def _space_width(self, value: float) -> None:
+        # precompute the /1000 form read by crlf_space_check per operator
+        self._space_width_raw = value
+        self._space_width_flt = value / 1000.0
+
+    @property
+    def space_width(self) -> float:
+        return self._space_width_flt
+
+    def thresholds(self, k: float) -> Tuple[float, float, float]:
+        """
+        Return the newline/alignment/gap thresholds used by ``crlf_space_check``.
+
+        ``font_size``, ``space_width`` and usually the matrix scale ``k`` stay
+        constant across dozens of consecutive text operators, so the three
+        products are memoized behind a comparison of the cached key.
+        """
+        cache = self._thresh_cache
+        if (
+            cache is not None
+            and cache[0] == self.font_size
+            and cache[1] == k
+            and cache[2] == self._space_width_flt
+        ):
+            return cache[3], cache[4], cache[5]
+        f = self.font_size * k
+        thresholds = (-0.8 * f, f * 0.3, self._space_width_flt * f * 15)
+        self._thresh_cache = (self.font_size, k, self._space_width_flt) + thresholds
+        return thresholds
+
+
 def set_custom_rtl(
     _min: Union[str, int, None] = None,
     _max: Union[str, int, None] = None,
@@ -61,225 +307,292 @@ def set_custom_rtl(
         CUSTOM_RTL_SPECIAL_CHARS = [ord(x) for x in specials]
     elif isinstance(specials, list):
         CUSTOM_RTL_SPECIAL_CHARS = specials
+    _rebuild_rtl_caches()
     return CUSTOM_RTL_MIN, CUSTOM_RTL_MAX, CUSTOM_RTL_SPECIAL_CHARS
 
 
-def mult(m: List[float], n: List[float]) -> List[float]:
-    return [
-        m[0] * n[0] + m[1] * n[2],
-        m[0] * n[1] + m[1] * n[3],
-        m[2] * n[0] + m[3] * n[2],
-        m[2] * n[1] + m[3] * n[3],
-        m[4] * n[0] + m[5] * n[2] + n[4],
-        m[4] * n[1] + m[5] * n[3] + n[5],
-    ]
-
-
-def orient(m: List[float]) -> int:
-    if m[3] > 1e-6:
-        return 0
-    elif m[3] < -1e-6:
-        return 180
-    elif m[1] > 0:
-        return 90
-    else:
-        return 270
+try:  # pragma: no cover
+    # optional dependency: when numba is installed the small numeric kernels
+    # below run as compiled machine code instead of interpreted bytecode
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is None:
+
+    def mult(m: List[float], n: List[float]) -> List[float]:
+        # Each element is subscripted exactly once: on this hot path the
+        # repeated BINARY_SUBSCR operations cost more than the multiplications.
+        m0, m1, m2, m3, m4, m5 = m[0], m[1], m[2], m[3], m[4], m[5]
+        n0, n1, n2, n3 = n[0], n[1], n[2], n[3]
+        return [
+            m0 * n0 + m1 * n2,
+            m0 * n1 + m1 * n3,
+            m2 * n0 + m3 * n2,
+            m2 * n1 + m3 * n3,
+            m4 * n0 + m5 * n2 + n[4],
+            m4 * n1 + m5 * n3 + n[5],
+        ]
+
+    def orient(m: List[float]) -> int:
+        m3 = m[3]
+        if m3 > 1e-6:
+            return 0
+        elif m3 < -1e-6:
+            return 180
+        elif m[1] > 0:
+            return 90
+        else:
+            return 270
+
+else:  # pragma: no cover
+    # the kernels take plain floats: numba compiles scalar signatures far
+    # better than reflected Python lists, and the wrappers keep the public
+    # list-based signatures (and int-keyed dict support) intact
+
+    @njit(cache=True, fastmath=True)
+    def _mult_kernel(
+        m0: float,
+        m1: float,
+        m2: float,
+        m3: float,
+        m4: float,
+        m5: float,
+        n0: float,
+        n1: float,
+        n2: float,
+        n3: float,
+        n4: float,
+        n5: float,
+    ) -> Tuple[float, float, float, float, float, float]:
+        return (
+            m0 * n0 + m1 * n2,
+            m0 * n1 + m1 * n3,
+            m2 * n0 + m3 * n2,
+            m2 * n1 + m3 * n3,
+            m4 * n0 + m5 * n2 + n4,
+            m4 * n1 + m5 * n3 + n5,
+        )
+
+    def mult(m: List[float], n: List[float]) -> List[float]:
+        return list(
+            _mult_kernel(
+                float(m[0]),
+                float(m[1]),
+                float(m[2]),
+                float(m[3]),
+                float(m[4]),
+                float(m[5]),
+                float(n[0]),
+                float(n[1]),
+                float(n[2]),
+                float(n[3]),
+                float(n[4]),
+                float(n[5]),
+            )
+        )
+
+    @njit(cache=True)
+    def _orient_kernel(m1: float, m3: float) -> int:
+        if m3 > 1e-6:
+            return 0
+        elif m3 < -1e-6:
+            return 180
+        elif m1 > 0:
+            return 90
+        else:
+            return 270
+
+    def orient(m: List[float]) -> int:
+        return int(_orient_kernel(float(m[1]), float(m[3])))
 
 
 def crlf_space_check(
     text: str,
-    cmtm_prev: Tuple[List[float], List[float]],
-    cmtm_matrix: Tuple[List[float], List[float]],
+    m_prev: List[float],
+    st: TextState,
     memo_cmtm: Tuple[List[float], List[float]],
-    cmap: Tuple[
-        Union[str, Dict[int, str]], Dict[str, str], str, Optional[DictionaryObject]
-    ],
     orientations: Tuple[int, ...],
-    output: str,
-    font_size: float,
+    output: List[str],
+    last_char: str,
     visitor_text: Optional[Callable[[Any, Any, Any, Any, Any], None]],
-    spacewidth: float,
-) -> Tuple[str, str, List[float], List[float]]:
-    cm_prev = cmtm_prev[0]
-    tm_prev = cmtm_prev[1]
-    cm_matrix = cmtm_matrix[0]
-    tm_matrix = cmtm_matrix[1]
+) -> Tuple[str, str, List[float]]:
+    # ``output`` is a list of already flushed chunks joined once at the end of
+    # the extraction; ``last_char`` memoizes the last character pushed to it
+    # ("" while empty) so we never have to rebuild the full string here.
+    # ``m_prev`` is the combined matrix returned by the previous call, so the
+    # previous product never has to be recomputed.
     memo_cm = memo_cmtm[0]
     memo_tm = memo_cmtm[1]
+    font_dict = st.cmap.font_dict
+    font_size = st.font_size
 
-    m_prev = mult(tm_prev, cm_prev)
-    m = mult(tm_matrix, cm_matrix)
-    orientation = orient(m)
+    m = st.m()
+    orientation = st.orientation()
     delta_x = m[4] - m_prev[4]
     delta_y = m[5] - m_prev[5]
-    k = math.sqrt(abs(m[0] * m[3]) + abs(m[1] * m[2]))
-    f = font_size * k
-    cm_prev = m
+    m0, m1, m2, m3 = m[0], m[1], m[2], m[3]
+    if m1 == 0.0 and m2 == 0.0:
+        # axis-aligned text, the overwhelmingly common case: the scale is
+        # sqrt(|m0 * m3|), and no sqrt at all is needed for uniform scaling
+        k = abs(m0) if m0 == m3 or m0 == -m3 else math.sqrt(abs(m0 * m3))
+    else:
+        k = math.sqrt(abs(m0 * m3) + abs(m1 * m2))
+    neg_nl_thresh, align_thresh, gap_thresh = st.thresholds(k)
     if orientation not in orientations:
         raise OrientationNotFoundError
-    try:
-        if orientation == 0:
-            if delta_y < -0.8 * f:
-                if (output + text)[-1] != "\n":
-                    output += text + "\n"
-                    if visitor_text is not None:
-                        visitor_text(
-                            text + "\n",
-                            memo_cm,
-                            memo_tm,
-                            cmap[3],
-                            font_size,
-                        )
-                    text = ""
-            elif (
-                abs(delta_y) < f * 0.3
-                and abs(delta_x) > spacewidth * f * 15
-                and (output + text)[-1] != " "
-            ):
-                text += " "
-        elif orientation == 180:
-            if delta_y > 0.8 * f:
-                if (output + text)[-1] != "\n":
-                    output += text + "\n"
-                    if visitor_text is not None:
-                        visitor_text(
-                            text + "\n",
-                            memo_cm,
-                            memo_tm,
-                            cmap[3],
-                            font_size,
-                        )
-                    text = ""
-            elif (
-                abs(delta_y) < f * 0.3
-                and abs(delta_x) > spacewidth * f * 15
-                and (output + text)[-1] != " "
-            ):
-                text += " "
-        elif orientation == 90:
-            if delta_x > 0.8 * f:
-                if (output + text)[-1] != "\n":
-                    output += text + "\n"
-                    if visitor_text is not None:
-                        visitor_text(
-                            text + "\n",
-                            memo_cm,
-                            memo_tm,
-                            cmap[3],
-                            font_size,
-                        )
-                    text = ""
-            elif (
-                abs(delta_x) < f * 0.3
-                and abs(delta_y) > spacewidth * f * 15
-                and (output + text)[-1] != " "
-            ):
-                text += " "
-        elif orientation == 270:
-            if delta_x < -0.8 * f:
-                if (output + text)[-1] != "\n":
-                    output += text + "\n"
-                    if visitor_text is not None:
-                        visitor_text(
-                            text + "\n",
-                            memo_cm,
-                            memo_tm,
-                            cmap[3],
-                            font_size,
-                        )
-                    text = ""
-            elif (
-                abs(delta_x) < f * 0.3
-                and abs(delta_y) > spacewidth * f * 15
-                and (output + text)[-1] != " "
-            ):
-                text += " "
-    except Exception:
-        pass
-    tm_prev = tm_matrix.copy()
-    cm_prev = cm_matrix.copy()
-    return text, output, cm_prev, tm_prev
+    nl_is_x, nl_sign = _ORIENT_PARAMS[orientation]
+    nl_val, sp_val = (delta_x, delta_y) if nl_is_x else (delta_y, delta_x)
+    # the last/"" sentinel checks make this block exception-free, so the
+    # historical try/except Exception guarding the empty-output IndexError
+    # (and its handler-setup cost per call) is no longer needed
+    last = text[-1] if text else last_char
+    if nl_sign * nl_val < neg_nl_thresh:
+        if last not in ("", "\n"):
+            output.append(text)
+            output.append("\n")
+            last_char = "\n"
+            if visitor_text is not None:
+                visitor_text(
+                    text + "\n",
+                    memo_cm,
+                    memo_tm,
+                    font_dict,
+                    font_size,
+                )
+            text = ""
+    elif (
+        abs(nl_val) < align_thresh
+        and abs(sp_val) > gap_thresh
+        and last not in ("", " ")
+    ):
+        text += " "
+    return text, last_char, m
 
 
 def handle_tj(
     text: str,
-    operands: List[Union[str, TextStringObject]],
-    cm_matrix: List[float],
-    tm_matrix: List[float],
-    cmap: Tuple[
-        Union[str, Dict[int, str]], Dict[str, str], str, Optional[DictionaryObject]
-    ],
+    operands: List[Union[str, bytes, TextStringObject]],
+    st: TextState,
     orientations: Tuple[int, ...],
-    output: str,
-    font_size: float,
-    rtl_dir: bool,
     visitor_text: Optional[Callable[[Any, Any, Any, Any, Any], None]],
-) -> Tuple[str, bool]:
-    m = mult(tm_matrix, cm_matrix)
-    orientation = orient(m)
+) -> str:
+    cm_matrix = st.cm_matrix
+    tm_matrix = st.tm_matrix
+    cmap = st.cmap
+    font_size = st.font_size
+    rtl_dir = st.rtl_dir
+    orientation = st.orientation()
     if orientation in orientations and len(operands) > 0:
-        if isinstance(operands[0], str):
-            text += operands[0]
+        operand = operands[0]
+        if isinstance(operand, str):
+            text += operand
         else:
-            t: str = ""
-            tt: bytes = (
-                encode_pdfdocencoding(operands[0])
-                if isinstance(operands[0], str)
-                else operands[0]
-            )
-            if isinstance(cmap[0], str):
+            tt: bytes = operand
+            encoding = cmap.encoding
+            if isinstance(encoding, str):
                 try:
-                    t = tt.decode(cmap[0], "surrogatepass")  # apply str encoding
+                    t = tt.decode(encoding, "surrogatepass")  # apply str encoding
                 except Exception:
                     # the data does not match the expectation,
                     # we use the alternative ;
                     # text extraction may not be good
                     t = tt.decode(
-                        "utf-16-be" if cmap[0] == "charmap" else "charmap",
+                        "utf-16-be" if encoding == "charmap" else "charmap",
                         "surrogatepass",
                     )  # apply str encoding
+            elif cmap.byte_table is not None:  # all-Latin-1 dict encoding
+                t = tt.translate(cmap.byte_table).decode("latin-1")
             else:  # apply dict encoding
-                t = "".join(
-                    [cmap[0][x] if x in cmap[0] else bytes((x,)).decode() for x in tt]
-                )
+                decode_table = cmap.decode_table
+                assert decode_table is not None
+                try:
+                    # a None entry raises the TypeError handled just below
+                    t = "".join([decode_table[x] for x in tt])  # type: ignore[misc]
+                except TypeError:
+                    # an unmapped non-ASCII byte: take the historical path so
+                    # the historical UnicodeDecodeError is raised
+                    t = "".join(
+                        [
+                            encoding[x] if x in encoding else bytes((x,)).decode()
+                            for x in tt
+                        ]
+                    )
             # "\u0590 - \u08FF \uFB50 - \uFDFF"
-            for x in [cmap[1][x] if x in cmap[1] else x for x in t]:
+            translate_table = cmap.translate_table
+            if translate_table is not None:
+                # iterating the translated str yields the same one-character
+                # units the comprehension would produce
+                run: str = t.translate(translate_table)
+                mapped: Union[List[str], str] = run
+            else:
+                map_dict = cmap.map_dict
+                mapped = [map_dict[x] if x in map_dict else x for x in t]
+                run = "".join(mapped)
+            if not rtl_dir and _RTL_SEARCH(run) is None:
+                # a fully left-to-right run (the common case): the per-glyph
+                # loop below would append every fragment in insertion order,
+                # so the whole run can be appended in one operation
+                return text + run
+            # the pending text is carried as a deque of fragments while
+            # looping: right-to-left glyphs prepend one fragment each, which
+            # would copy the whole pending text per glyph on a plain string
+            parts: "deque[str]" = deque((text,)) if text else deque()
+            # bind the per-glyph lookups to locals: LOAD_FAST is measurably
+            # cheaper than LOAD_GLOBAL in this loop
+            rtl_class = _RTL_CLASS
+            special_set = _SPECIAL_SET
+            rtl_min = CUSTOM_RTL_MIN
+            rtl_max = CUSTOM_RTL_MAX
+            _ord = ord
+            for x in mapped:
                 # x can be a sequence of bytes ; ex: habibi.pdf
                 if len(x) == 1:
-                    xx = ord(x)
+                    xx = _ord(x)
                 else:
                     xx = 1
-                # fmt: off
-                if (
-                    # cases where the current inserting order is kept
-                    (xx <= 0x2F)                        # punctuations but...
-                    or 0x3A <= xx <= 0x40               # numbers (x30-39)
-                    or 0x2000 <= xx <= 0x206F           # upper punctuations..
-                    or 0x20A0 <= xx <= 0x21FF           # but (numbers) indices/exponents
-                    or xx in CUSTOM_RTL_SPECIAL_CHARS   # customized....
-                ):
-                    text = x + text if rtl_dir else text + x
-                elif (  # right-to-left characters set
-                    0x0590 <= xx <= 0x08FF
-                    or 0xFB1D <= xx <= 0xFDFF
-                    or 0xFE70 <= xx <= 0xFEFF
-                    or CUSTOM_RTL_MIN <= xx <= CUSTOM_RTL_MAX
-                ):
+                if xx < 0x10000:
+                    cls = rtl_class[xx]
+                # beyond the basic multilingual plane only the custom
+                # parameters can change the default left-to-right class
+                elif xx in special_set:
+                    cls = 0
+                elif rtl_min <= xx <= rtl_max:
+                    cls = 1
+                else:
+                    cls = 2
+                if cls == 0:  # keep the current insertion order
+                    if rtl_dir:
+                        parts.appendleft(x)
+                    else:
+                        parts.append(x)
+                elif cls == 1:  # right-to-left character
                     if not rtl_dir:
                         rtl_dir = True
-                        output += text
                         if visitor_text is not None:
-                            visitor_text(text, cm_matrix, tm_matrix, cmap[3], font_size)
-                        text = ""
-                    text = x + text
-                else:  # left-to-right
-                    # print(">",xx,x,end="")
+                            visitor_text(
+                                "".join(parts),
+                                cm_matrix,
+                                tm_matrix,
+                                cmap.font_dict,
+                                font_size,
+                            )
+                        parts.clear()
+                    parts.appendleft(x)
+                else:  # left-to-right character
                     if rtl_dir:
                         rtl_dir = False
-                        output += text
                         if visitor_text is not None:
-                            visitor_text(text, cm_matrix, tm_matrix, cmap[3], font_size)
-                        text = ""
-                    text = text + x
-                # fmt: on
-    return text, rtl_dir
+                            visitor_text(
+                                "".join(parts),
+                                cm_matrix,
+                                tm_matrix,
+                                cmap.font_dict,
+                                font_size,
+                            )
+                        parts.clear()
+                    parts.append(x)
+            text = "".join(parts)
+    st.rtl_dir = rtl_dir
+    return text
@@ -8,8 +8,9 @@ from pathlib import Path
 
 import pytest
 
+import pypdf._text_extraction
 from pypdf import PdfReader, mult
-from pypdf._text_extraction import set_custom_rtl
+from pypdf._text_extraction import CharMap, TextState, handle_tj, set_custom_rtl
 
 from . import get_data_from_url
 
@@ -61,6 +62,48 @@ def test_multi_language(visitor_text):
     assert "حَبيبي" in reader.pages[3].extract_text(visitor_text=visitor_text)
 
 
+def test_set_custom_rtl_rebuilds_caches():
+    te = pypdf._text_extraction
+    try:
+        set_custom_rtl(0x3000, 0x1F640, "ab")
+        assert {ord("a"), ord("b")} == te._SPECIAL_SET
+        # the classification table follows the custom range in the BMP...
+        assert te._RTL_CLASS[0x3001] == 1
+        # ...while the specials keep the current insertion order
+        assert te._RTL_CLASS[ord("a")] == 0
+        # the prefilter regex covers the astral part of the custom range
+        assert te._RTL_SEARCH("x\U0001F601y") is not None
+        assert te._RTL_SEARCH("plain text") is None
+        # a range lying entirely beyond the chr() range is a no-op
+        set_custom_rtl(0x110000, 0x110005, [])
+        assert te._RTL_SEARCH("\U0010FFFF") is None
+    finally:
+        set_custom_rtl(-1, -1, [])  # to prevent further errors
+    # the default tables are restored
+    assert te._RTL_CLASS[0x3001] == 2
+    assert te._RTL_CLASS[0x05D0] == 1
+    assert frozenset() == te._SPECIAL_SET
+
+
+def test_dict_encoding_fast_path_and_fallback():
+    # an all-Latin-1 dict encoding decodes through the byte translation table
+    cmap = CharMap(dict(zip(range(256), map(chr, range(256)))), {}, "/F1", None)
+    assert cmap.byte_table is not None
+    st = TextState()
+    st.cmap = cmap
+    assert handle_tj("", [b"A\xe9"], st, (0, 90, 180, 270), None) == "A\xe9"
+
+    # a non-Latin-1 codepoint disables the fast path but not the decode table
+    st.cmap = CharMap({0x41: "Ω"}, {}, "/F2", None)
+    assert st.cmap.byte_table is None
+    assert handle_tj("", [b"AB"], st, (0, 90, 180, 270), None) == "ΩB"
+
+    # an unmapped non-ASCII byte falls back to the historical slow path and
+    # its historical UnicodeDecodeError
+    with pytest.raises(UnicodeDecodeError):
+        handle_tj("", [b"\xe9"], st, (0, 90, 180, 270), None)
+
+
 @pytest.mark.parametrize(
     ("file_name", "constraints"),
     [